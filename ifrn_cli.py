@@ -6,29 +6,81 @@ from __future__ import annotations
 import argparse
 import csv
 import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
 from pathlib import Path
 
 DEFAULT_CSV = Path("data/ifrn_2026_resultado.csv")
+NON_DIGIT_RE = re.compile(r"\D")
 
 
 def normalize_inscricao(value: str) -> str:
-    digits = re.sub(r"\D", "", value or "")
+    digits = NON_DIGIT_RE.sub("", value or "")
     if len(digits) >= 8:
         return f"{digits[:7]}-{digits[7]}"
     return value.strip()
 
 
+def is_normalized_inscricao(value: str) -> bool:
+    return len(value) == 9 and value[7] == "-" and value.replace("-", "", 1).isdecimal()
+
+
 def load_matches(csv_path: Path, inscricao: str) -> list[dict[str, str]]:
     wanted = normalize_inscricao(inscricao)
     matches: list[dict[str, str]] = []
     with csv_path.open("r", encoding="utf-8", newline="") as fp:
-        reader = csv.DictReader(fp)
+        reader = csv.reader(fp)
+        header = next(reader, [])
+        if "inscricao" not in header:
+            return matches
+        idx = header.index("inscricao")
         for row in reader:
-            if normalize_inscricao(row.get("inscricao", "")) == wanted:
-                matches.append(row)
+            if len(row) <= idx:
+                continue
+            # O CSV gerado pelo parser ja traz a inscricao normalizada; so
+            # normaliza valores fora do formato 0000000-0.
+            value = row[idx]
+            if value == wanted or (
+                not is_normalized_inscricao(value)
+                and normalize_inscricao(value) == wanted
+            ):
+                matches.append(dict(zip(header, row)))
     return matches
 
 
+@dataclass
+class InscricaoIndex:
+    header: list[str]
+    keys: list[str]
+    rows: list[list[str]]
+
+
+def load_index(csv_path: Path) -> InscricaoIndex:
+    entries: list[tuple[str, list[str]]] = []
+    with csv_path.open("r", encoding="utf-8", newline="") as fp:
+        reader = csv.reader(fp)
+        header = next(reader, [])
+        if "inscricao" in header:
+            idx = header.index("inscricao")
+            for row in reader:
+                if len(row) > idx:
+                    entries.append((normalize_inscricao(row[idx]), row))
+    # Ordenacao estavel: inscricoes repetidas mantem a ordem do CSV.
+    entries.sort(key=lambda entry: entry[0])
+    return InscricaoIndex(
+        header=header,
+        keys=[key for key, _ in entries],
+        rows=[row for _, row in entries],
+    )
+
+
+def lookup(index: InscricaoIndex, inscricao: str) -> list[dict[str, str]]:
+    wanted = normalize_inscricao(inscricao)
+    start = bisect_left(index.keys, wanted)
+    end = bisect_right(index.keys, wanted, lo=start)
+    return [dict(zip(index.header, row)) for row in index.rows[start:end]]
+
+
 def print_result(rows: list[dict[str, str]]) -> None:
     if not rows:
         print("Inscricao nao encontrada.")
@@ -62,6 +114,7 @@ def print_result(rows: list[dict[str, str]]) -> None:
 
 
 def run_interactive(csv_path: Path) -> None:
+    index = load_index(csv_path)
     print("Modo interativo. Digite a inscricao (ou 'sair').")
     while True:
         raw = input("> ").strip()
@@ -69,7 +122,7 @@ def run_interactive(csv_path: Path) -> None:
             return
         if not raw:
             continue
-        rows = load_matches(csv_path, raw)
+        rows = lookup(index, raw)
         print_result(rows)
 
 
@@ -11,11 +11,15 @@ import argparse
 import csv
 import json
 import math
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, NamedTuple, Optional
 
+import numpy as np
 from docling.backend.docling_parse_v4_backend import DoclingParseV4DocumentBackend
 from docling.datamodel.base_models import InputFormat
 from docling.datamodel.document import InputDocument
@@ -23,11 +27,42 @@ from docling.datamodel.document import InputDocument
 INSCRICAO_RE = re.compile(r"^\d{7}-\d$")
 CLASSIFICACAO_RE = re.compile(r"^\d+º$")
 NUMERIC_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+OFERTA_RE = re.compile(r"^n[ºo]\s*(\d+)\s+(.*)$", re.IGNORECASE)
 
 ROW_TOP_PADDING = 6.0
+PAGES_PER_CHUNK = 32
 TABLE_HEADER_CUTOFF_Y = 45.0
+HEADER_MAX_Y = 170.0
+
+HEADER_TOKENS = frozenset(
+    {
+        "inscrição",
+        "nome",
+        "classificação",
+        "situação",
+        "redação",
+        "final",
+        "português",
+        "matemática",
+        "escore final",
+        "escore final bonificado",
+        "escore português",
+        "escore matemática",
+        "escore português bonificado",
+        "escore matemática bonificado",
+    }
+)
+
+OFERTA_FIELDS = (
+    "oferta_numero",
+    "oferta_texto",
+    "curso",
+    "forma",
+    "campus",
+    "turno",
+)
 
-OUTPUT_FIELDS = [
+OUTPUT_FIELDS = (
     "inscricao",
     "nome",
     "classificacao",
@@ -48,14 +83,21 @@ OUTPUT_FIELDS = [
     "turno",
     "lista",
     "pagina_pdf",
-]
+)
+OUTPUT_ROW_TEMPLATE: dict[str, str] = dict.fromkeys(OUTPUT_FIELDS, "")
 
+# json.dumps(..., ensure_ascii=False) monta um JSONEncoder novo a cada chamada.
+JSONL_ENCODER = json.JSONEncoder(ensure_ascii=False)
 
-@dataclass
-class Cell:
+
+class Cell(NamedTuple):
     text: str
     x: float
     y: float
+    # Sem default: as flags vem de make_cell, unico ponto que classifica o texto.
+    is_insc: bool
+    is_num: bool
+    is_score: bool
 
 
 @dataclass
@@ -67,32 +109,85 @@ class PageLayout:
     score_anchors: list[tuple[str, float]]
 
 
+@dataclass
+class PageBounds:
+    name_left: float
+    name_right: float
+    class_left: float
+    class_right: float
+    situ_left: float
+    situ_right: float
+    score_left: float
+    score_names: list[str]
+    score_anchors: list[tuple[str, float]]
+
+
+@dataclass
+class PageResult:
+    page_ix: int
+    layout: Optional[PageLayout]
+    oferta: Optional[tuple[str, ...]]
+    lista: Optional[str]
+    # rows fica None quando o layout vem de uma pagina fora do lote do worker;
+    # nesse caso as celulas voltam para o processo principal terminar o parsing.
+    rows: Optional[list[dict[str, str]]]
+    cells: list[Cell]
+
+
+# Equivalentes a INSCRICAO_RE, NUMERIC_RE e CLASSIFICACAO_RE, mas so com metodos
+# de str. `value` ja chega sem espacos nas bordas (ver normalize_spaces).
 def is_inscricao(value: str) -> bool:
-    return bool(INSCRICAO_RE.fullmatch(value.strip()))
+    return (
+        len(value) == 9
+        and value[7] == "-"
+        and value[:7].isdecimal()
+        and value[8].isdecimal()
+    )
 
 
 def is_numeric(value: str) -> bool:
-    return bool(NUMERIC_RE.fullmatch(value.strip()))
+    if value.startswith("-"):
+        value = value[1:]
+    integer, dot, fraction = value.partition(".")
+    return integer.isdecimal() and (not dot or fraction.isdecimal())
 
 
-def is_score_value(value: str) -> bool:
-    value = value.strip()
-    return value == "-" or is_numeric(value)
+def is_classificacao(value: str) -> bool:
+    return len(value) > 1 and value.endswith("º") and value[:-1].isdecimal()
 
 
 def normalize_spaces(value: str) -> str:
+    # Todo espaco em branco alem de " " e nao imprimivel: um texto imprimivel
+    # sem " " e um token unico (caso comum das notas) e ja esta normalizado.
+    if " " not in value and value.isprintable():
+        return value
     return " ".join(value.split())
 
 
+def make_cell(text: str, x: float, y: float) -> Cell:
+    # Classifica o texto uma unica vez; o parsing usa apenas as flags.
+    numeric = is_numeric(text)
+    return Cell(
+        text=text,
+        x=x,
+        y=y,
+        is_insc=is_inscricao(text),
+        is_num=numeric,
+        # Nota: valor numerico ou "-" (sem nota).
+        is_score=text == "-" or numeric,
+    )
+
+
 def sort_cells(cells: Iterable[Cell]) -> list[Cell]:
     return sorted(cells, key=lambda c: (c.y, c.x))
 
 
-def parse_oferta(text: str) -> dict[str, str]:
+@lru_cache(maxsize=4096)
+def parse_oferta(text: str) -> tuple[str, ...]:
     text = normalize_spaces(text)
-    match = re.match(r"^n[ºo]\s*(\d+)\s+(.*)$", text, flags=re.IGNORECASE)
+    match = OFERTA_RE.match(text)
     if not match:
-        return {}
+        return ()
 
     oferta_numero = match.group(1)
     oferta_texto = match.group(2).strip()
@@ -107,55 +202,47 @@ def parse_oferta(text: str) -> dict[str, str]:
     if ", forma " in curso_forma:
         curso, forma = curso_forma.split(", forma ", 1)
 
-    return {
-        "oferta_numero": oferta_numero,
-        "oferta_texto": oferta_texto,
-        "curso": curso.strip(),
-        "forma": forma.strip(),
-        "campus": campus.strip(),
-        "turno": turno.strip(),
-    }
+    # Mesma ordem de OFERTA_FIELDS.
+    return (
+        oferta_numero,
+        oferta_texto,
+        curso.strip(),
+        forma.strip(),
+        campus.strip(),
+        turno.strip(),
+    )
 
 
-def find_first_x(
-    cells: list[Cell], token: str, y_max: float = 170.0, exact: bool = False
-) -> Optional[float]:
-    token_lower = token.lower()
-    for cell in sort_cells(cells):
+def find_header_xs(
+    cells: list[Cell], y_max: float = HEADER_MAX_Y
+) -> tuple[dict[str, float], list[float]]:
+    # Primeira ocorrencia de cada cabecalho em ordem de leitura (y, x);
+    # "Bonificado" se repete em varias colunas e volta como lista ordenada.
+    first: dict[str, tuple[float, float]] = {}
+    bonificados: list[float] = []
+    for cell in cells:
         if cell.y > y_max:
             continue
         text = cell.text.lower()
-        matched = text == token_lower if exact else token_lower in text
-        if matched:
-            return cell.x
-    return None
-
-
-def find_all_x(
-    cells: list[Cell], token: str, y_max: float = 170.0, exact: bool = False
-) -> list[float]:
-    token_lower = token.lower()
-    xs = []
-    for c in cells:
-        if c.y > y_max:
-            continue
-        text = c.text.lower()
-        matched = text == token_lower if exact else token_lower in text
-        if matched:
-            xs.append(c.x)
-    return sorted(xs)
-
-
-def detect_layout(cells: list[Cell], previous: Optional[PageLayout]) -> PageLayout:
-    inscricao_x = find_first_x(cells, "Inscrição", exact=True)
-    nome_x = find_first_x(cells, "Nome", exact=True)
-    classificacao_x = find_first_x(cells, "Classificação", exact=True)
-    situacao_x = find_first_x(cells, "Situação", exact=True)
-    redacao_x = find_first_x(cells, "Redação", exact=True)
-    final_x = find_first_x(cells, "Final", exact=True)
-    portugues_x = find_first_x(cells, "Português", exact=True)
-    matematica_x = find_first_x(cells, "Matemática", exact=True)
-    bonificados = find_all_x(cells, "Bonificado", exact=True)
+        if text == "bonificado":
+            bonificados.append(cell.x)
+        elif text in HEADER_TOKENS:
+            position = (cell.y, cell.x)
+            if text not in first or position < first[text]:
+                first[text] = position
+    return {text: x for text, (_, x) in first.items()}, sorted(bonificados)
+
+
+def detect_layout(cells: list[Cell]) -> Optional[PageLayout]:
+    header_xs, bonificados = find_header_xs(cells)
+    inscricao_x = header_xs.get("inscrição")
+    nome_x = header_xs.get("nome")
+    classificacao_x = header_xs.get("classificação")
+    situacao_x = header_xs.get("situação")
+    redacao_x = header_xs.get("redação")
+    final_x = header_xs.get("final")
+    portugues_x = header_xs.get("português")
+    matematica_x = header_xs.get("matemática")
 
     split_header_mode = (
         final_x is not None
@@ -175,16 +262,12 @@ def detect_layout(cells: list[Cell], previous: Optional[PageLayout]) -> PageLayo
             ("escore_matematica_bonificado", bonificados[2]),
         ]
     else:
-        escore_final_x = find_first_x(cells, "Escore Final", exact=True)
-        escore_final_bon_x = find_first_x(cells, "Escore Final Bonificado", exact=True)
-        escore_port_x = find_first_x(cells, "Escore Português", exact=True)
-        escore_mat_x = find_first_x(cells, "Escore Matemática", exact=True)
-        escore_port_bon_x = find_first_x(
-            cells, "Escore Português Bonificado", exact=True
-        )
-        escore_mat_bon_x = find_first_x(
-            cells, "Escore Matemática Bonificado", exact=True
-        )
+        escore_final_x = header_xs.get("escore final")
+        escore_final_bon_x = header_xs.get("escore final bonificado")
+        escore_port_x = header_xs.get("escore português")
+        escore_mat_x = header_xs.get("escore matemática")
+        escore_port_bon_x = header_xs.get("escore português bonificado")
+        escore_mat_bon_x = header_xs.get("escore matemática bonificado")
         if (
             escore_final_x is not None
             and escore_final_bon_x is not None
@@ -214,11 +297,7 @@ def detect_layout(cells: list[Cell], previous: Optional[PageLayout]) -> PageLayo
         or redacao_x is None
         or not score_anchors
     ):
-        if previous is None:
-            raise RuntimeError(
-                "Nao foi possivel detectar layout da tabela e nao ha layout anterior."
-            )
-        return previous
+        return None
     return PageLayout(
         inscricao_x=inscricao_x,
         nome_x=nome_x,
@@ -228,41 +307,52 @@ def detect_layout(cells: list[Cell], previous: Optional[PageLayout]) -> PageLayo
     )
 
 
-def parse_row_band(
-    inscricao: str, row_y: float, row_cells: list[Cell], layout: PageLayout
-) -> dict[str, Optional[str]]:
-    ordered = sort_cells(row_cells)
-
+def compute_page_bounds(layout: PageLayout) -> PageBounds:
     score_min_x = min(x for _, x in layout.score_anchors)
-    name_left = layout.nome_x - 8.0
-    name_right = layout.classificacao_x - 8.0
-    class_left = layout.classificacao_x - 20.0
-    class_right = layout.situacao_x - 8.0
-    situ_left = layout.situacao_x - 10.0
-    situ_right = score_min_x - 6.0
+    return PageBounds(
+        name_left=layout.nome_x - 8.0,
+        name_right=layout.classificacao_x - 8.0,
+        class_left=layout.classificacao_x - 20.0,
+        class_right=layout.situacao_x - 8.0,
+        situ_left=layout.situacao_x - 10.0,
+        situ_right=score_min_x - 6.0,
+        score_left=score_min_x - 20.0,
+        score_names=[score_name for score_name, _ in layout.score_anchors],
+        score_anchors=list(layout.score_anchors),
+    )
+
+
+def parse_row_band(
+    inscricao: str, row_y: float, row_cells: list[Cell], bounds: PageBounds
+) -> dict[str, str]:
+    # row_cells ja chega em ordem de leitura (ver extract_rows_from_page).
+    name_left, name_right = bounds.name_left, bounds.name_right
+    class_left, class_right = bounds.class_left, bounds.class_right
+    situ_left, situ_right = bounds.situ_left, bounds.situ_right
+    score_names = bounds.score_names
+    score_anchors = bounds.score_anchors
 
     name_parts = [
         c.text
-        for c in ordered
-        if name_left <= c.x < name_right and not is_inscricao(c.text)
+        for c in row_cells
+        if name_left <= c.x < name_right and not c.is_insc
     ]
-    classificacao_parts = [c.text for c in ordered if class_left <= c.x < class_right]
+    classificacao_parts = [c.text for c in row_cells if class_left <= c.x < class_right]
     situacao_parts = [
         c.text
-        for c in ordered
+        for c in row_cells
         if situ_left <= c.x < situ_right
-        and not is_numeric(c.text)
-        and not CLASSIFICACAO_RE.fullmatch(c.text)
+        and not c.is_num
+        and not is_classificacao(c.text)
     ]
 
     candidate_name = normalize_spaces(" ".join(name_parts))
     classificacao = normalize_spaces(
-        " ".join([c for c in classificacao_parts if CLASSIFICACAO_RE.fullmatch(c)])
+        " ".join([c for c in classificacao_parts if is_classificacao(c)])
     )
     situacao = normalize_spaces(" ".join(situacao_parts))
 
-    score_cells = [c for c in ordered if c.x >= score_min_x - 20.0 and is_score_value(c.text)]
-    score_names = [score_name for score_name, _ in layout.score_anchors]
+    score_cells = [c for c in row_cells if c.x >= bounds.score_left and c.is_score]
 
     best_scores: dict[str, str] = {}
     score_cells_by_x = sorted(score_cells, key=lambda c: c.x)
@@ -273,7 +363,7 @@ def parse_row_band(
         scored_candidates: dict[str, tuple[float, str]] = {}
         for cell in score_cells:
             anchor_name, anchor_x = min(
-                layout.score_anchors, key=lambda anchor: abs(cell.x - anchor[1])
+                score_anchors, key=lambda anchor: abs(cell.x - anchor[1])
             )
             distance = abs(cell.x - anchor_x)
             if distance > 45.0:
@@ -300,26 +390,53 @@ def parse_row_band(
 
 def extract_rows_from_page(
     cells: list[Cell], layout: PageLayout
-) -> list[dict[str, Optional[str]]]:
-    inscricao_cells = sort_cells([c for c in cells if is_inscricao(c.text)])
+) -> list[dict[str, str]]:
+    ordered = sort_cells(cells)
+    # Filtrar a lista ja ordenada preserva a ordem (y, x) sem um segundo sort.
+    inscricao_cells = [c for c in ordered if c.is_insc]
     if not inscricao_cells:
         return []
 
-    rows: list[dict[str, Optional[str]]] = []
-    for idx, current in enumerate(inscricao_cells):
-        next_y = inscricao_cells[idx + 1].y if idx + 1 < len(inscricao_cells) else math.inf
-        row_start = current.y - ROW_TOP_PADDING
-        row_end = next_y - ROW_TOP_PADDING
-        row_cells = [
-            c
-            for c in cells
-            if row_start <= c.y < row_end and c.y >= TABLE_HEADER_CUTOFF_Y
-        ]
-        rows.append(parse_row_band(current.text, current.y, row_cells, layout))
+    ordered_ys = np.fromiter((c.y for c in ordered), dtype=np.float64, count=len(ordered))
+    inscricao_ys = np.fromiter(
+        (c.y for c in inscricao_cells), dtype=np.float64, count=len(inscricao_cells)
+    )
+    row_starts = np.maximum(inscricao_ys - ROW_TOP_PADDING, TABLE_HEADER_CUTOFF_Y)
+    row_ends = np.append(inscricao_ys[1:], math.inf) - ROW_TOP_PADDING
+    band_starts = np.searchsorted(ordered_ys, row_starts, side="left").tolist()
+    band_ends = np.searchsorted(ordered_ys, row_ends, side="left").tolist()
+
+    bounds = compute_page_bounds(layout)
+    rows: list[dict[str, str]] = []
+    for current, start, end in zip(inscricao_cells, band_starts, band_ends):
+        rows.append(parse_row_band(current.text, current.y, ordered[start:end], bounds))
     return rows
 
 
-def run(pdf_path: Path, csv_out: Path, jsonl_out: Path, max_pages: Optional[int]) -> None:
+def build_output_rows(
+    page_rows: list[dict[str, str]], page_context: dict[str, str], page_ix: int
+) -> list[dict[str, str]]:
+    page_fields = {
+        "numero": page_context.get("oferta_numero", ""),
+        "oferta_numero": page_context.get("oferta_numero", ""),
+        "oferta_texto": page_context.get("oferta_texto", ""),
+        "curso": page_context.get("curso", ""),
+        "forma": page_context.get("forma", ""),
+        "campus": page_context.get("campus", ""),
+        "turno": page_context.get("turno", ""),
+        "lista": page_context.get("lista", ""),
+        "pagina_pdf": str(page_ix + 1),
+    }
+    output_rows: list[dict[str, str]] = []
+    for row in page_rows:
+        output_row = OUTPUT_ROW_TEMPLATE.copy()
+        output_row.update(row)
+        output_row.update(page_fields)
+        output_rows.append(output_row)
+    return output_rows
+
+
+def open_pdf(pdf_path: Path) -> InputDocument:
     input_doc = InputDocument(
         path_or_stream=pdf_path,
         format=InputFormat.PDF,
@@ -327,87 +444,149 @@ def run(pdf_path: Path, csv_out: Path, jsonl_out: Path, max_pages: Optional[int]
     )
     if not input_doc.valid:
         raise RuntimeError(f"Falha ao abrir PDF: {pdf_path}")
+    return input_doc
 
-    backend = input_doc._backend
-    total_pages = input_doc.page_count
-    page_limit = min(total_pages, max_pages) if max_pages else total_pages
 
-    csv_out.parent.mkdir(parents=True, exist_ok=True)
-    jsonl_out.parent.mkdir(parents=True, exist_ok=True)
+def parse_pages(
+    backend: DoclingParseV4DocumentBackend, page_ixs: range
+) -> list[PageResult]:
+    layout: Optional[PageLayout] = None
+    results: list[PageResult] = []
 
-    current_context: dict[str, str] = {}
-    current_layout: Optional[PageLayout] = None
-    all_rows: list[dict[str, str]] = []
-
-    for page_ix in range(page_limit):
+    # Aliases locais: o laco de ingestao roda uma vez por celula do PDF.
+    normalize = normalize_spaces
+    new_cell = make_cell
+    for page_ix in page_ixs:
         page = backend.load_page(page_ix)
-        raw_cells = list(page.get_text_cells())
-        page_cells = []
-        for raw in raw_cells:
-            box = raw.rect.to_bounding_box()
-            text = normalize_spaces(raw.text)
+        page_cells: list[Cell] = []
+        append_cell = page_cells.append
+        for raw in page.get_text_cells():
+            text = normalize(raw.text)
             if not text:
                 continue
-            page_cells.append(Cell(text=text, x=box.l, y=box.t))
+            box = raw.rect.to_bounding_box()
+            append_cell(new_cell(text, box.l, box.t))
+        page.unload()
 
         oferta_cell = next((c for c in page_cells if c.text.startswith("nº ")), None)
         lista_cell = next((c for c in page_cells if c.text.startswith("Lista ")), None)
-        current_layout = detect_layout(page_cells, current_layout)
-
-        page_context = dict(current_context)
-        if oferta_cell:
-            page_context.update(parse_oferta(oferta_cell.text))
-        if lista_cell:
-            page_context["lista"] = lista_cell.text
-        if oferta_cell or lista_cell:
-            current_context = dict(page_context)
-
-        page_rows = extract_rows_from_page(page_cells, current_layout)
-        for row in page_rows:
-            output_row = {field: "" for field in OUTPUT_FIELDS}
-            output_row.update(
-                {
-                    "inscricao": row.get("inscricao", "") or "",
-                    "nome": row.get("nome", "") or "",
-                    "classificacao": row.get("classificacao", "") or "",
-                    "situacao": row.get("situacao", "") or "",
-                    "escore_final": row.get("escore_final", "") or "",
-                    "escore_final_bonificado": row.get("escore_final_bonificado", "") or "",
-                    "redacao": row.get("redacao", "") or "",
-                    "escore_portugues": row.get("escore_portugues", "") or "",
-                    "escore_matematica": row.get("escore_matematica", "") or "",
-                    "escore_portugues_bonificado": row.get("escore_portugues_bonificado", "") or "",
-                    "escore_matematica_bonificado": row.get("escore_matematica_bonificado", "") or "",
-                    "numero": page_context.get("oferta_numero", ""),
-                    "oferta_numero": page_context.get("oferta_numero", ""),
-                    "oferta_texto": page_context.get("oferta_texto", ""),
-                    "curso": page_context.get("curso", ""),
-                    "forma": page_context.get("forma", ""),
-                    "campus": page_context.get("campus", ""),
-                    "turno": page_context.get("turno", ""),
-                    "lista": page_context.get("lista", ""),
-                    "pagina_pdf": str(page_ix + 1),
-                }
+        page_layout = detect_layout(page_cells)
+        if page_layout is not None:
+            layout = page_layout
+
+        rows = extract_rows_from_page(page_cells, layout) if layout is not None else None
+        results.append(
+            PageResult(
+                page_ix=page_ix,
+                layout=page_layout,
+                oferta=parse_oferta(oferta_cell.text) if oferta_cell else None,
+                lista=lista_cell.text if lista_cell else None,
+                rows=rows,
+                cells=page_cells if rows is None else [],
             )
-            all_rows.append(output_row)
+        )
 
-        if (page_ix + 1) % 50 == 0 or page_ix + 1 == page_limit:
-            print(f"[{page_ix + 1}/{page_limit}] linhas acumuladas: {len(all_rows)}")
+    return results
 
-        page.unload()
 
-    with csv_out.open("w", newline="", encoding="utf-8") as fp:
-        writer = csv.DictWriter(fp, fieldnames=OUTPUT_FIELDS)
-        writer.writeheader()
-        writer.writerows(all_rows)
+# Backend aberto uma vez por processo do pool (ver init_worker), em vez de
+# reabrir o PDF a cada lote de paginas.
+_worker_backend: Optional[DoclingParseV4DocumentBackend] = None
+
+
+def init_worker(pdf_path: Path) -> None:
+    global _worker_backend
+    _worker_backend = open_pdf(pdf_path)._backend
+
+
+def parse_pages_in_worker(page_ixs: range) -> list[PageResult]:
+    assert _worker_backend is not None
+    return parse_pages(_worker_backend, page_ixs)
+
 
-    with jsonl_out.open("w", encoding="utf-8") as fp:
-        for row in all_rows:
-            fp.write(json.dumps(row, ensure_ascii=False) + "\n")
+def iter_page_results(
+    pdf_path: Path,
+    backend: DoclingParseV4DocumentBackend,
+    chunks: list[range],
+    workers: int,
+) -> Iterator[list[PageResult]]:
+    if workers <= 1:
+        for chunk in chunks:
+            yield parse_pages(backend, chunk)
+        return
 
-    missing_names = sum(1 for r in all_rows if not r["nome"])
-    missing_score = sum(1 for r in all_rows if not r["escore_final"])
-    print(f"Extração concluída. Total de registros: {len(all_rows)}")
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(pdf_path,)
+    ) as executor:
+        # executor.map devolve os lotes em ordem, entao layout e contexto
+        # continuam sendo propagados pagina a pagina como no modo sequencial.
+        yield from executor.map(parse_pages_in_worker, chunks)
+
+
+def run(
+    pdf_path: Path,
+    csv_out: Path,
+    jsonl_out: Path,
+    max_pages: Optional[int],
+    workers: Optional[int] = None,
+) -> None:
+    input_doc = open_pdf(pdf_path)
+    backend = input_doc._backend
+    total_pages = input_doc.page_count
+    page_limit = min(total_pages, max_pages) if max_pages else total_pages
+    chunks = [
+        range(start, min(start + PAGES_PER_CHUNK, page_limit))
+        for start in range(0, page_limit, PAGES_PER_CHUNK)
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+    csv_out.parent.mkdir(parents=True, exist_ok=True)
+    jsonl_out.parent.mkdir(parents=True, exist_ok=True)
+
+    current_context: dict[str, str] = {}
+    current_layout: Optional[PageLayout] = None
+    total_rows = 0
+    missing_names = 0
+    missing_score = 0
+
+    with csv_out.open("w", newline="", encoding="utf-8") as csv_fp, jsonl_out.open(
+        "w", encoding="utf-8"
+    ) as jsonl_fp:
+        writer = csv.DictWriter(csv_fp, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+
+        for results in iter_page_results(pdf_path, backend, chunks, workers):
+            for result in results:
+                page_ix = result.page_ix
+                if result.layout is not None:
+                    current_layout = result.layout
+                if current_layout is None:
+                    raise RuntimeError(
+                        "Nao foi possivel detectar layout da tabela e nao ha layout anterior."
+                    )
+
+                page_context = dict(current_context)
+                if result.oferta is not None:
+                    page_context.update(zip(OFERTA_FIELDS, result.oferta))
+                if result.lista is not None:
+                    page_context["lista"] = result.lista
+                if result.oferta is not None or result.lista is not None:
+                    current_context = dict(page_context)
+
+                page_rows = result.rows
+                if page_rows is None:
+                    page_rows = extract_rows_from_page(result.cells, current_layout)
+                output_rows = build_output_rows(page_rows, page_context, page_ix)
+                writer.writerows(output_rows)
+                jsonl_fp.writelines(JSONL_ENCODER.encode(r) + "\n" for r in output_rows)
+                total_rows += len(output_rows)
+                missing_names += sum(1 for r in output_rows if not r["nome"])
+                missing_score += sum(1 for r in output_rows if not r["escore_final"])
+
+                if (page_ix + 1) % 50 == 0 or page_ix + 1 == page_limit:
+                    print(f"[{page_ix + 1}/{page_limit}] linhas gravadas: {total_rows}")
+
+    print(f"Extração concluída. Total de registros: {total_rows}")
     print(f"Sem nome: {missing_names} | Sem escore_final: {missing_score}")
     print(f"CSV: {csv_out}")
     print(f"JSONL: {jsonl_out}")
@@ -442,6 +621,12 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Limita páginas para teste (opcional).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processos para ler as páginas (padrão: número de CPUs).",
+    )
     return parser.parse_args()
 
 
@@ -452,4 +637,5 @@ if __name__ == "__main__":
         csv_out=args.csv_out,
         jsonl_out=args.jsonl_out,
         max_pages=args.max_pages,
+        workers=args.workers,
     )